@@ -1,3 +1,4 @@
+import numpy as np
 import jax
 import jax.numpy as jnp
 from jax import lax
@@ -6,6 +7,17 @@ from typing import Tuple, Optional
 import chex
 from flax import struct
 
+# Number of entity slots - one per row between top and bottom border
+NUM_SLOTS = 8
+# Player coordinate offsets for full action set ['n','l','u','r','d','f']
+# NumPy (not jnp) so that importing gymnax does not initialize a backend
+_PLAYER_DX = np.array([0, -1, 0, 1, 0, 0], dtype=np.int32)
+_PLAYER_DY = np.array([0, 0, -1, 0, 1, 0], dtype=np.int32)
+# Obs channels indexed by [gold, filled] and [filled] of an entity
+# Enemy channel 1, Trail channel 2, Gold channel 3, Not used 4 (dropped)
+_ENTITY_CHANNEL = np.array([[4, 1], [4, 3]], dtype=np.int8)
+_TRAIL_CHANNEL = np.array([4, 2], dtype=np.int8)
+
 
 @struct.dataclass
 class EnvState:
@@ -18,6 +30,9 @@ class EnvState:
     move_timer: int
     ramp_timer: int
     ramp_index: int
+    # (NUM_SLOTS, 5) int8 array with one row per slot/row and columns
+    # 0: Position x, 1: Position y (slot + 1), 2: lr (from l to r dir),
+    # 3: Gold indicator, 4: whether entity is filled/not an open slot
     entities: chex.Array
     time: int
     terminal: bool
@@ -25,7 +40,8 @@ class EnvState:
 
 @struct.dataclass
 class EnvParams:
-    ramping: bool = True
+    # Static flag - folds the ramping branch into the compiled step
+    ramping: bool = struct.field(pytree_node=False, default=True)
     ramp_interval: int = 100
     init_spawn_speed: int = 10
     init_move_interval: int = 5
@@ -73,18 +89,13 @@ class MinAsterix(environment.Environment):
         self, key: chex.PRNGKey, state: EnvState, action: int, params: EnvParams
     ) -> Tuple[chex.Array, EnvState, float, bool, dict]:
         """Perform single timestep state transition."""
-        # Spawn enemy if timer up - sample at each step & select based on timer
-        spawn_entities_now = state.spawn_timer == 0
-        entity, slot = spawn_entity(key, state)
-        entities = lax.select(
-            spawn_entities_now,
-            state.entities.at[slot].set(entity),
-            state.entities,
-        )
-        spawn_timer = lax.select(
-            spawn_entities_now, state.spawn_speed, state.spawn_timer
+        # Spawn enemy if timer up - only sample new entity if spawning
+        state = lax.cond(
+            state.spawn_timer == 0,
+            lambda s: step_spawn(key, s),
+            lambda s: s,
+            state,
         )
-        state = state.replace(entities=entities, spawn_timer=spawn_timer)
 
         # Update state of the players
         a = self.action_set[action]
@@ -112,41 +123,43 @@ class MinAsterix(environment.Environment):
         self, key: chex.PRNGKey, params: EnvParams
     ) -> Tuple[chex.Array, EnvState]:
         """Reset environment state by sampling initial position."""
+        # Use fixed integer dtypes so that batched/auto-reset states match
         state = EnvState(
-            player_x=5,
-            player_y=5,
-            shot_timer=0,
-            spawn_speed=params.init_spawn_speed,
-            spawn_timer=params.init_spawn_speed,
-            move_speed=params.init_move_interval,
-            move_timer=params.init_move_interval,
-            ramp_timer=params.ramp_interval,
-            ramp_index=0,
-            entities=jnp.zeros((8, 5), dtype=int),
-            time=0,
-            terminal=False,
+            player_x=jnp.asarray(5, dtype=jnp.int32),
+            player_y=jnp.asarray(5, dtype=jnp.int32),
+            shot_timer=jnp.asarray(0, dtype=jnp.int32),
+            spawn_speed=jnp.asarray(params.init_spawn_speed, dtype=jnp.int32),
+            spawn_timer=jnp.asarray(params.init_spawn_speed, dtype=jnp.int32),
+            move_speed=jnp.asarray(params.init_move_interval, dtype=jnp.int32),
+            move_timer=jnp.asarray(params.init_move_interval, dtype=jnp.int32),
+            ramp_timer=jnp.asarray(params.ramp_interval, dtype=jnp.int32),
+            ramp_index=jnp.asarray(0, dtype=jnp.int32),
+            entities=jnp.zeros((NUM_SLOTS, 5), dtype=jnp.int8),
+            time=jnp.asarray(0, dtype=jnp.int32),
+            terminal=jnp.asarray(False),
         )
         return self.get_obs(state), state
 
     def get_obs(self, state: EnvState) -> chex.Array:
         """Return observation from raw state trafo."""
-        # Add a 5th channel to help with not used entities
-        obs = jnp.zeros((10, 10, 5), dtype=bool)
-        # Set the position of the agent in the grid
-        obs = obs.at[state.player_y, state.player_x, 0].set(1)
-        # Loop over entity identities and set entity locations
-        for i in range(state.entities.shape[0]):
-            x = state.entities[i, :]
-            # Enemy channel 1, Trail channel 2, Gold channel 3, Not used 4
-            c = 3 * x[3] + 1 * (1 - x[3])
-            c_eff = c * x[4] + 4 * (1 - x[4])
-            obs = obs.at[x[1], x[0], c_eff].set(1)
-
-            back_x = (x[0] - 1) * x[2] + (x[0] + 1) * (1 - x[2])
-            leave_trail = jnp.logical_and(back_x >= 0, back_x <= 9)
-            c_eff = 2 * x[4] + 4 * (1 - x[4])
-            obs = obs.at[x[1], back_x, c_eff].set(leave_trail)
-        return obs[:, :, :4].astype(jnp.float32)
+        xs, ys, lrs, golds, filled = state.entities.T
+        c_eff = jnp.asarray(_ENTITY_CHANNEL)[golds, filled]
+        # Negative indices wrap around - route out-of-frame trails to channel 4
+        back_x = jnp.where(lrs, xs - 1, xs + 1)
+        leave_trail = jnp.logical_and(back_x >= 0, back_x <= 9)
+        c_trail = jnp.asarray(_TRAIL_CHANNEL)[filled * leave_trail]
+        back_x = jnp.clip(back_x, 0, 9)
+
+        # Set agent, entity & trail cells in the grid with a single scatter
+        # Unused entities/trails write to out-of-range channel 4 and are dropped
+        rows = jnp.concatenate([jnp.atleast_1d(state.player_y), ys, ys])
+        cols = jnp.concatenate([jnp.atleast_1d(state.player_x), xs, back_x])
+        channels = jnp.concatenate(
+            [jnp.zeros(1, dtype=jnp.int8), c_eff, c_trail]
+        )
+        obs = jnp.zeros(self.obs_shape, dtype=bool)
+        obs = obs.at[rows, cols, channels].set(True, mode="drop")
+        return obs.astype(jnp.float32)
 
     def is_terminal(self, state: EnvState, params: EnvParams) -> bool:
         """Check whether state is terminal."""
@@ -186,7 +199,7 @@ class MinAsterix(environment.Environment):
                 "move_timer": spaces.Discrete(1000),
                 "ramp_timer": spaces.Discrete(1000),
                 "ramp_index": spaces.Discrete(1000),
-                "entities": spaces.Box(0, 1, (8, 5)),
+                "entities": spaces.Box(0, 1, (NUM_SLOTS, 5)),
                 "time": spaces.Discrete(params.max_steps_in_episode),
                 "terminal": spaces.Discrete(2),
             }
@@ -195,137 +208,113 @@ class MinAsterix(environment.Environment):
 
 def step_agent(state: EnvState, action: int) -> EnvState:
     """Update the position of the agent."""
-    # Resolve player action via implicit conditional updates of coordinates
-    player_x = (
-        jnp.maximum(0, state.player_x - 1) * (action == 1)  # l
-        + jnp.minimum(9, state.player_x + 1) * (action == 3)  # r
-        + state.player_x * jnp.logical_and(action != 1, action != 3)
-    )  # others
-
-    player_y = (
-        jnp.maximum(1, state.player_y - 1) * (action == 2)  # u
-        + jnp.minimum(8, state.player_y + 1) * (action == 4)  # d
-        + state.player_y * jnp.logical_and(action != 2, action != 4)
-    )  # others
+    # Resolve player action via coordinate offset lookup & border clipping
+    dx = jnp.asarray(_PLAYER_DX)[action]
+    dy = jnp.asarray(_PLAYER_DY)[action]
+    player_x = jnp.clip(state.player_x + dx, 0, 9)
+    player_y = jnp.clip(state.player_y + dy, 1, 8)
     return state.replace(player_x=player_x, player_y=player_y)
 
 
+def step_spawn(key: chex.PRNGKey, state: EnvState) -> EnvState:
+    """Spawn a new entity into a free slot and reset the spawn timer."""
+    entity, slot = spawn_entity(key, state)
+    entities = lax.select(
+        entity[4] == 1, state.entities.at[slot].set(entity), state.entities
+    )
+    return state.replace(entities=entities, spawn_timer=state.spawn_speed)
+
+
 def spawn_entity(key: chex.PRNGKey, state: EnvState) -> Tuple[chex.Array, int]:
     """Spawn new enemy or treasure at random location
     with random direction (if all rows are filled do nothing).
     """
-    key_lr, key_gold, key_slot = jax.random.split(key, 3)
-    lr = jax.random.choice(key_lr, jnp.array([1, 0]))
-    is_gold = jax.random.choice(
-        key_gold, jnp.array([1, 0]), p=jnp.array([1 / 3, 2 / 3])
-    )
+    # Derive independent streams for direction, gold and slot sampling
+    key_lr = jax.random.fold_in(key, 0)
+    key_gold = jax.random.fold_in(key, 1)
+    key_slot = jax.random.fold_in(key, 2)
+    # Move l-to-r with prob 1/2 & spawn gold (instead of enemy) with prob 1/3
+    lr = jax.random.bernoulli(key_lr).astype(jnp.int8)
+    is_gold = jax.random.bernoulli(key_gold, p=1 / 3).astype(jnp.int8)
     x = (1 - lr) * 9  # l-to-r starts at 0
-    # Entities are represented as 5 dimensional arrays
-    # 0: Position y, 1: Slot x, 2: lr (from l to r dir), 3: Gold indicator
-    # 4: whether entity is filled/not an open slot
-
+    # Entities are represented as 5 dimensional arrays - see EnvState
     # Sampling problem: Need to get rid of jnp.where due to concretization
-    # Sample random order of entries to go through
-    # Check if element is free with while loop and stop if position is found
-    # or all elements have been checked
+    # Sample random order of entries to go through and pick first free one
     state_entities = state.entities[:, 4]  # Only use col 4 indicating free
     slot, free = while_sample_slots(key_slot, state_entities)
-    entity = jnp.array([x, slot + 1, lr, is_gold, free])
+    entity = jnp.array([x, slot + 1, lr, is_gold, free], dtype=jnp.int8)
     return entity, slot
 
 
 def while_sample_slots(
     key: chex.PRNGKey, state_entities: chex.Array
 ) -> Tuple[int, int]:
-    """Go through random order of slots until slot is found that is free."""
-    init_val = jnp.array([0, 0])
+    """Pick the first free slot in a random order of the slots."""
     # Sample random order of slot entries to go through - hack around jnp.where
-    order_to_go_through = jax.random.permutation(key, jnp.arange(8))
-    perm_entities = state_entities[order_to_go_through]
-
-    def condition_to_check(val):
-        # Check if we haven't gone through all possible slots and whether free
-        return jnp.logical_and(val[0] < 7, val[1] == 0)
-
-    def update(val):
-        # Increase list counter - slot that has been checked
-        val = val.at[0].set(val[0] + 1)
-        # Check if slot is still free
-        free = perm_entities[val[0]] == 0
-        val = val.at[1].set(free)
-        return val
-
-    id_and_free = jax.lax.while_loop(condition_to_check, update, init_val)
-    # Return slot id and whether it is free
-    slot_id = order_to_go_through[id_and_free[0]]
-    free_slot = id_and_free[1]
+    order_to_go_through = jax.random.permutation(key, jnp.arange(NUM_SLOTS))
+    available = state_entities[order_to_go_through] == 0
+    # argmax returns 0 if no slot is free - report availability separately
+    slot_id = order_to_go_through[jnp.argmax(available)]
+    free_slot = jnp.any(available).astype(jnp.int32)
     return slot_id, free_slot
 
 
 def step_entities(state: EnvState) -> Tuple[EnvState, float, bool]:
     """Update positions of the entities and return reward, done."""
-    done, reward = 0, 0
-    # Loop over entities and check for collisions - either gold or enemy
+    # Check all entities for collisions at once - either gold or enemy
+    px, py = state.player_x, state.player_y
     entities = state.entities
-    for i in range(8):
-        x = entities[i]
-        slot_filled = x[4] != 0
-        # Get boolean for any collision with either gold or enemy
-        coords = jnp.logical_and(x[0] == state.player_x, x[1] == state.player_y)
-        collision = jnp.logical_and(coords, slot_filled)
-        # If collision with gold: empty gold and give positive reward
-        collision_gold = jnp.logical_and(collision, x[3])
-        reward += collision_gold
-        # Set row i to zeros if collision with gold
-        entities = entities.at[i].set(x * (1 - collision_gold))
-
-        # If collision with enemy: terminate the episode
-        collision_enemy = jnp.logical_and(collision, 1 - x[3])
-        done += collision_enemy
-
-    # Loop over entities and move them in direction
+    slot_filled = entities[:, 4] != 0
+    is_gold = entities[:, 3] != 0
+    collision = (entities[:, 0] == px) & (entities[:, 1] == py) & slot_filled
+    # If collision with gold: empty gold and give positive reward
+    collision_gold = jnp.logical_and(collision, is_gold)
+    reward = jnp.sum(collision_gold)
+    entities = jnp.where(collision_gold[:, None], 0, entities)
+    # If collision with enemy: terminate the episode
+    done = jnp.any(jnp.logical_and(collision, ~is_gold))
+
+    # Move all filled entities in their direction if it is time to move
     time_to_move = state.move_timer == 0
     move_timer = jax.lax.select(
         time_to_move, state.move_speed, state.move_timer
     )
-
-    old_entities = entities
-    for i in range(8):
-        x = entities[i]
-        slot_filled = x[4] != 0
-        lr = x[2]
-        # Update position left and right move
-        x = x.at[0].set(
-            jax.lax.select(slot_filled, x[0] + 1 * lr - 1 * (1 - lr), x[0])
-        )
-
-        # Update if entity moves out of the frame - reset everything to zeros
-        outside_of_frame = jnp.logical_or(x[0] < 0, x[0] > 9)
-        entities = jax.lax.select(
-            time_to_move,
-            entities.at[i].set(x * slot_filled * (1 - outside_of_frame)),
-            old_entities,
-        )
-
-        # Update if entity moves into the player after its state is updated
-        coords = jnp.logical_and(x[0] == state.player_x, x[1] == state.player_y)
-        collision = jnp.logical_and(coords, slot_filled)
-        # If collision with gold: empty gold and give positive reward
-        collision_gold = jnp.logical_and(collision, x[3])
-        reward += jax.lax.select(time_to_move, collision_gold, False) * 1
-        entities = jax.lax.select(
-            time_to_move,
-            entities.at[i].set(entities[i] * (1 - collision_gold)),
-            old_entities,
-        )
-        # If collision with enemy: terminate the episode
-        collision_enemy = jnp.logical_and(collision, 1 - x[3])
-        done += jax.lax.select(time_to_move, collision_enemy, False)
+    no_collision = jnp.zeros(NUM_SLOTS, dtype=bool)
+    entities, collision_gold, collision_enemy = jax.lax.cond(
+        time_to_move,
+        lambda e: move_entities(e, px, py),
+        lambda e: (e, no_collision, no_collision),
+        entities,
+    )
+    reward += jnp.sum(collision_gold)
+    done = jnp.logical_or(done, jnp.any(collision_enemy))
     return (
         state.replace(entities=entities, move_timer=move_timer),
         reward,
-        done > 0,
+        done,
+    )
+
+
+def move_entities(
+    entities: chex.Array, player_x: int, player_y: int
+) -> Tuple[chex.Array, chex.Array, chex.Array]:
+    """Move entities one step and return gold/enemy collision masks."""
+    slot_filled = entities[:, 4] != 0
+    is_gold = entities[:, 3] != 0
+    new_x = jnp.where(
+        slot_filled, entities[:, 0] + 2 * entities[:, 2] - 1, entities[:, 0]
     )
+    # Update if entity moves into the player after its position is updated
+    collision = (new_x == player_x) & (entities[:, 1] == player_y) & slot_filled
+    collision_gold = jnp.logical_and(collision, is_gold)
+    collision_enemy = jnp.logical_and(collision, ~is_gold)
+    # Reset entities that move out of the frame or are collected as gold
+    outside_of_frame = jnp.logical_or(new_x < 0, new_x > 9)
+    keep = jnp.logical_and(
+        slot_filled, jnp.logical_and(~outside_of_frame, ~collision_gold)
+    )
+    entities = jnp.where(keep[:, None], entities.at[:, 0].set(new_x), 0)
+    return entities, collision_gold, collision_enemy
 
 
 def step_timers(state: EnvState, params: EnvParams) -> EnvState:
@@ -333,34 +322,31 @@ def step_timers(state: EnvState, params: EnvParams) -> EnvState:
     spawn_timer = state.spawn_timer - 1
     move_timer = state.move_timer - 1
 
-    # Ramp difficulty if interval has elapsed
+    # Ramp difficulty if interval has elapsed - otherwise count down timer
     ramp_cond = jnp.logical_and(
         params.ramping,
         jnp.logical_or(state.spawn_speed > 1, state.move_speed > 1),
     )
-    # 1. Update ramp_timer
-    timer_cond = jnp.logical_and(ramp_cond, state.ramp_timer >= 0)
-    ramp_timer = jax.lax.select(
-        timer_cond, state.ramp_timer - 1, params.ramp_interval
+    ramp_now = jnp.logical_and(ramp_cond, state.ramp_timer < 0)
+    ramp_timer = state.ramp_timer - jnp.logical_and(
+        ramp_cond, state.ramp_timer >= 0
     )
-    # 2. Update move_speed
-    move_speed_cond = jnp.logical_and(
-        jnp.logical_and(ramp_cond, 1 - timer_cond),
-        jnp.logical_and(state.move_speed, state.ramp_index % 2),
+    state = state.replace(
+        spawn_timer=spawn_timer, move_timer=move_timer, ramp_timer=ramp_timer
+    )
+    return jax.lax.cond(
+        ramp_now, lambda s: ramp_difficulty(s, params), lambda s: s, state
     )
-    move_speed = state.move_speed - move_speed_cond
-    # 3. Update spawn_speed
-    spawn_speed_cond = jnp.logical_and(
-        jnp.logical_and(ramp_cond, 1 - timer_cond), state.spawn_speed > 1
+
+
+def ramp_difficulty(state: EnvState, params: EnvParams) -> EnvState:
+    """Increase the speed/spawn rate of enemies and reset the ramp timer."""
+    move_speed_cond = jnp.logical_and(
+        state.move_speed > 1, state.ramp_index % 2 == 1
     )
-    spawn_speed = state.spawn_speed - spawn_speed_cond
-    # 4. Update ramp_index
-    ramp_index = state.ramp_index + jnp.logical_and(ramp_cond, 1 - timer_cond)
     return state.replace(
-        spawn_timer=spawn_timer,
-        move_timer=move_timer,
-        ramp_timer=ramp_timer,
-        move_speed=move_speed,
-        spawn_speed=spawn_speed,
-        ramp_index=ramp_index,
+        move_speed=state.move_speed - move_speed_cond,
+        spawn_speed=state.spawn_speed - (state.spawn_speed > 1),
+        ramp_index=state.ramp_index + 1,
+        ramp_timer=jnp.full_like(state.ramp_timer, params.ramp_interval),
     )
@@ -0,0 +1,256 @@
+"""Optional numba backend of Asterix-MinAtar for single-env CPU stepping."""
+
+from typing import Optional, Tuple
+import numpy as np
+import jax
+import jax.numpy as jnp
+import chex
+
+try:
+    import numba
+except ImportError:
+    raise ImportError("You need to install `numba` to use the numba backend.")
+
+from gymnax.environments import spaces
+from .asterix import EnvParams, NUM_SLOTS
+
+# Flat state layout - scalar entries followed by (NUM_SLOTS, 5) entities
+PLAYER_X, PLAYER_Y, SHOT_TIMER, SPAWN_SPEED, SPAWN_TIMER = 0, 1, 2, 3, 4
+MOVE_SPEED, MOVE_TIMER, RAMP_TIMER, RAMP_INDEX, TIME, TERMINAL = range(5, 11)
+ENTITIES = 11
+STATE_SIZE = ENTITIES + NUM_SLOTS * 5
+
+
+class MinAsterixNumba(object):
+    """
+    Numba version of Asterix MinAtar environment for single environment
+    interaction (e.g. interactive play or debugging) where XLA dispatch
+    dominates the cost of a step. Mirrors `MinAsterix` dynamics, but the
+    state is a flat NumPy int32 array of size `STATE_SIZE` and randomness
+    comes from a per-instance `np.random.Generator`, which is reseeded from
+    the key passed to `reset` (the `key` passed to `step` is ignored).
+    Use the default JAX `MinAsterix` for `jit`/`vmap`-based training.
+    """
+
+    def __init__(self, use_minimal_action_set: bool = True):
+        self.obs_shape = (10, 10, 4)
+        # Full action set: ['n','l','u','r','d','f']
+        self.full_action_set = np.array([0, 1, 2, 3, 4, 5])
+        # Minimal action set: ['n', 'l', 'u', 'r', 'd']
+        self.minimal_action_set = np.array([0, 1, 2, 3, 4])
+        # Set active action set for environment
+        # If minimal map to integer in full action set
+        if use_minimal_action_set:
+            self.action_set = self.minimal_action_set
+        else:
+            self.action_set = self.full_action_set
+        # Per-instance RNG so that multiple envs do not share a random state
+        self.rng = np.random.default_rng()
+
+    @property
+    def default_params(self) -> EnvParams:
+        # Default environment parameters
+        return EnvParams()
+
+    def step(
+        self,
+        key: chex.PRNGKey,
+        state: np.ndarray,
+        action: int,
+        params: Optional[EnvParams] = None,
+    ) -> Tuple[np.ndarray, np.ndarray, float, bool, dict]:
+        """Performs step transition and auto-resets on termination."""
+        # `key` is unused - the instance RNG is seeded in `reset` (API parity)
+        if params is None:
+            params = self.default_params
+        state, reward = step_state(
+            state,
+            self.action_set[action],
+            params.ramping,
+            params.ramp_interval,
+            self.rng,
+        )
+        done = bool(
+            state[TERMINAL] or state[TIME] >= params.max_steps_in_episode
+        )
+        info = {"discount": 0.0 if done else 1.0}
+        if done:
+            obs, state = self.reset(None, params)
+        else:
+            obs = get_obs(state)
+        return obs, state, float(reward), done, info
+
+    def reset(
+        self,
+        key: Optional[chex.PRNGKey] = None,
+        params: Optional[EnvParams] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Performs resetting of environment (reseeds RNG if key given)."""
+        if params is None:
+            params = self.default_params
+        if key is not None:
+            seed = int(jax.random.randint(key, (), 0, 2**31 - 1))
+            self.rng = np.random.default_rng(seed)
+        state = reset_state(
+            params.init_spawn_speed,
+            params.init_move_interval,
+            params.ramp_interval,
+        )
+        return get_obs(state), state
+
+    def get_obs(self, state: np.ndarray) -> np.ndarray:
+        """Return observation from raw state trafo."""
+        return get_obs(state)
+
+    @property
+    def name(self) -> str:
+        """Environment name."""
+        return "Asterix-MinAtar"
+
+    @property
+    def num_actions(self) -> int:
+        """Number of actions possible in environment."""
+        return len(self.action_set)
+
+    def action_space(
+        self, params: Optional[EnvParams] = None
+    ) -> spaces.Discrete:
+        """Action space of the environment."""
+        return spaces.Discrete(len(self.action_set))
+
+    def observation_space(self, params: EnvParams) -> spaces.Box:
+        """Observation space of the environment."""
+        return spaces.Box(0, 1, self.obs_shape)
+
+    def state_space(self, params: EnvParams) -> spaces.Box:
+        """State space of the environment (flat int32 state array)."""
+        return spaces.Box(0, 1000, (STATE_SIZE,), jnp.int32)
+
+
+@numba.njit(cache=True)
+def reset_state(
+    init_spawn_speed: int, init_move_interval: int, ramp_interval: int
+) -> np.ndarray:
+    """Build the flat initial state array."""
+    state = np.zeros(STATE_SIZE, dtype=np.int32)
+    state[PLAYER_X] = 5
+    state[PLAYER_Y] = 5
+    state[SPAWN_SPEED] = init_spawn_speed
+    state[SPAWN_TIMER] = init_spawn_speed
+    state[MOVE_SPEED] = init_move_interval
+    state[MOVE_TIMER] = init_move_interval
+    state[RAMP_TIMER] = ramp_interval
+    return state
+
+
+@numba.njit(cache=True)
+def get_obs(state: np.ndarray) -> np.ndarray:
+    """Return observation from raw state trafo."""
+    obs = np.zeros((10, 10, 4), dtype=np.float32)
+    obs[state[PLAYER_Y], state[PLAYER_X], 0] = 1
+    entities = state[ENTITIES:].reshape(NUM_SLOTS, 5)
+    for i in range(NUM_SLOTS):
+        x = entities[i]
+        if x[4]:
+            # Enemy channel 1, Trail channel 2, Gold channel 3
+            obs[x[1], x[0], 3 if x[3] else 1] = 1
+            back_x = x[0] - 1 if x[2] else x[0] + 1
+            if back_x >= 0 and back_x <= 9:
+                obs[x[1], back_x, 2] = 1
+    return obs
+
+
+@numba.njit(cache=True)
+def step_state(
+    state: np.ndarray,
+    action: int,
+    ramping: bool,
+    ramp_interval: int,
+    rng: np.random.Generator,
+) -> Tuple[np.ndarray, int]:
+    """Perform single timestep state transition and return reward."""
+    state = state.copy()
+    entities = state[ENTITIES:].reshape(NUM_SLOTS, 5)
+    reward = 0
+
+    # Spawn enemy if timer up
+    if state[SPAWN_TIMER] == 0:
+        spawn_entity(entities, rng)
+        state[SPAWN_TIMER] = state[SPAWN_SPEED]
+
+    # Resolve player action
+    if action == 1:
+        state[PLAYER_X] = max(0, state[PLAYER_X] - 1)
+    elif action == 3:
+        state[PLAYER_X] = min(9, state[PLAYER_X] + 1)
+    elif action == 2:
+        state[PLAYER_Y] = max(1, state[PLAYER_Y] - 1)
+    elif action == 4:
+        state[PLAYER_Y] = min(8, state[PLAYER_Y] + 1)
+
+    # Update entities, get reward and figure out termination
+    for i in range(NUM_SLOTS):
+        x = entities[i]
+        if x[4] and x[0] == state[PLAYER_X] and x[1] == state[PLAYER_Y]:
+            if x[3]:
+                x[:] = 0
+                reward += 1
+            else:
+                state[TERMINAL] = 1
+
+    if state[MOVE_TIMER] == 0:
+        state[MOVE_TIMER] = state[MOVE_SPEED]
+        for i in range(NUM_SLOTS):
+            x = entities[i]
+            if x[4]:
+                x[0] += 1 if x[2] else -1
+                if x[0] < 0 or x[0] > 9:
+                    x[:] = 0
+                elif x[0] == state[PLAYER_X] and x[1] == state[PLAYER_Y]:
+                    if x[3]:
+                        x[:] = 0
+                        reward += 1
+                    else:
+                        state[TERMINAL] = 1
+
+    # Update timers and ramp difficulty if interval has elapsed
+    state[SPAWN_TIMER] -= 1
+    state[MOVE_TIMER] -= 1
+    if ramping and (state[SPAWN_SPEED] > 1 or state[MOVE_SPEED] > 1):
+        if state[RAMP_TIMER] >= 0:
+            state[RAMP_TIMER] -= 1
+        else:
+            if state[MOVE_SPEED] > 1 and state[RAMP_INDEX] % 2:
+                state[MOVE_SPEED] -= 1
+            if state[SPAWN_SPEED] > 1:
+                state[SPAWN_SPEED] -= 1
+            state[RAMP_INDEX] += 1
+            state[RAMP_TIMER] = ramp_interval
+    state[TIME] += 1
+    return state, reward
+
+
+@numba.njit(cache=True)
+def spawn_entity(entities: np.ndarray, rng: np.random.Generator) -> None:
+    """Spawn new enemy or treasure at random location
+    with random direction (if all rows are filled do nothing).
+    """
+    lr = rng.random() < 0.5
+    is_gold = rng.random() < 1 / 3
+    num_free = 0
+    for i in range(NUM_SLOTS):
+        num_free += entities[i, 4] == 0
+    if num_free == 0:
+        return
+    # Pick uniformly among the free slots
+    choice = rng.integers(0, num_free)
+    for i in range(NUM_SLOTS):
+        if entities[i, 4] == 0:
+            if choice == 0:
+                entities[i, 0] = 0 if lr else 9
+                entities[i, 1] = i + 1
+                entities[i, 2] = lr
+                entities[i, 3] = is_gold
+                entities[i, 4] = 1
+                return
+            choice -= 1
@@ -314,8 +314,8 @@ def step_agent(state: EnvState, action: int, env_params: EnvParams) -> EnvState:
     )
     bullet_array = jnp.array([state["sub_x"], state["sub_y"], state["sub_or"]])
     # Use counter to keep track of row idx to update!
-    f_bullets_add = jax.ops.index_update(
-        state["f_bullets"], jax.ops.index[state["f_bullet_count"]], bullet_array
+    f_bullets_add = (
+        state["f_bullets"].at[state["f_bullet_count"]].set(bullet_array)
     )
     state["f_bullets"] = lax.select(
         bullet_cond, f_bullets_add, state["f_bullets"]
@@ -340,10 +340,8 @@ def step_bullets(state: EnvState) -> Tuple[EnvState, float]:
         bullet_border = jnp.logical_or(
             bullet_to_check[0] < 0, bullet_to_check[0] > 9
         )
-        f_bullets = jax.ops.index_update(
-            f_bullets,
-            jax.ops.index(f_bullet_count),
-            bullet_to_check * (1 - bullet_border),
+        f_bullets = f_bullets.at[f_bullet_count].set(
+            bullet_to_check * (1 - bullet_border)
         )
         f_bullet_count += 1 - bullet_border
 
@@ -365,10 +363,8 @@ def collision_and_remove(indiv_to_check, entity_counter, entities):
     for e_id in range(entity_counter):
         hit = (indiv_to_check[0:2] == entities[e_id][0:2]).all()
         # If no hit - add entity to array and increase clean counter
-        entities_clean = jax.ops.index_update(
-            entities_clean,
-            jax.ops.index(entity_counter_clean),
-            entities[e_id] * (1 - hit),
+        entities_clean = entities_clean.at[entity_counter_clean].set(
+            entities[e_id] * (1 - hit)
         )
         entity_counter_clean += hit
     return
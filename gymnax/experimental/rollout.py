@@ -46,7 +46,7 @@ class RolloutWrapper(object):
 
     @partial(jax.jit, static_argnums=(0,))
     def single_rollout(self, rng_input, policy_params):
-        """Rollout a pendulum episode with lax.scan."""
+        """Rollout a gymnax episode with lax.scan."""
         # Reset the environment
         rng_reset, rng_episode = jax.random.split(rng_input)
         obs, state = self.env.reset(rng_reset, self.env_params)
@@ -87,7 +87,7 @@ class RolloutWrapper(object):
                 jnp.array([1.0]),
             ],
             (),
-            self.env_params.max_steps_in_episode,
+            self.num_env_steps,
         )
         # Return the sum of rewards accumulated by agent in episode rollout
         obs, action, reward, next_obs, done = scan_out
@@ -34,6 +34,13 @@ def make(env_id: str, **env_kwargs):
     if env_id not in registered_envs:
         raise ValueError(f"{env_id} is not in registered gymnax environments.")
 
+    # Optional numba backend - only available for single-env Asterix
+    backend = env_kwargs.pop("backend", "jax")
+    if backend not in ("jax", "numba"):
+        raise ValueError(f"{backend} is not a supported backend (jax/numba).")
+    if backend == "numba" and env_id not in numba_envs:
+        raise ValueError(f"{env_id} has no numba backend.")
+
     # 1. Classic OpenAI Control Tasks
     if env_id == "Pendulum-v1":
         env = Pendulum(**env_kwargs)
@@ -64,7 +71,12 @@ def make(env_id: str, **env_kwargs):
 
     # 3. MinAtar Environments
     elif env_id == "Asterix-MinAtar":
-        env = MinAsterix(**env_kwargs)
+        if backend == "numba":
+            from .environments.minatar.asterix_numba import MinAsterixNumba
+
+            env = MinAsterixNumba(**env_kwargs)
+        else:
+            env = MinAsterix(**env_kwargs)
     elif env_id == "Breakout-MinAtar":
         env = MinBreakout(**env_kwargs)
     elif env_id == "Freeway-MinAtar":
@@ -126,3 +138,6 @@ registered_envs = [
     "Swimmer-misc",
     "Pong-misc",
 ]
+
+# Environments that can be made with `backend="numba"`
+numba_envs = ["Asterix-MinAtar"]
@@ -197,11 +197,13 @@ def minatar_np_to_jax(
 ):
     """Collects env state of MinAtar into dict for JAX `step`."""
     if env_name == "Asterix-MinAtar":
-        entities_array = jnp.zeros((8, 5), dtype=jnp.int32)
-        for i in range(8):
+        from gymnax.environments.minatar.asterix import NUM_SLOTS
+
+        entities_array = jnp.zeros((NUM_SLOTS, 5), dtype=jnp.int8)
+        for i in range(NUM_SLOTS):
             if env.env.entities[i] is not None:
                 entities_array = entities_array.at[i, 0:4].set(
-                    env.env.entities[i]
+                    jnp.array(env.env.entities[i], dtype=jnp.int8)
                 )
                 entities_array = entities_array.at[i, 4].set(1)
         state_gym_to_jax = {
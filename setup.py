@@ -35,6 +35,7 @@ git_tar = f"https://github.com/RobertTLange/gymnax/archive/v{verstr}.tar.gz"
 
 requires = ["jax", "jaxlib", "chex", "flax", "pyyaml", "gym>=0.26"]
 test_requires = ["bsuite", "minatar"]
+numba_requires = ["numba>=0.56"]
 
 setup(
     name="gymnax",
@@ -61,4 +62,5 @@ setup(
     python_requires=">=3.7",
     install_requires=requires,
     tests_require=test_requires,
+    extras_require={"numba": numba_requires},
 )
@@ -1,4 +1,7 @@
 import jax
+import jax.numpy as jnp
+import numpy as np
+import pytest
 import gymnax
 from gymnax.utils import (
     np_state_to_jax,
@@ -12,6 +15,8 @@ from gymnax.environments.minatar.asterix import (
     step_agent,
     step_entities,
     step_timers,
+    step_spawn,
+    while_sample_slots,
 )
 from asterix_helpers import (
     step_agent_numpy,
@@ -21,6 +26,18 @@ from asterix_helpers import (
 
 num_episodes, num_steps, tolerance = 5, 10, 1e-04
 env_name_gym, env_name_jax = "asterix", "Asterix-MinAtar"
+# Scalar state entries stored at the front of the flat numba state
+numba_state_keys = (
+    "player_x",
+    "player_y",
+    "shot_timer",
+    "spawn_speed",
+    "spawn_timer",
+    "move_speed",
+    "move_timer",
+    "ramp_timer",
+    "ramp_index",
+)
 
 
 def test_sub_steps():
@@ -55,6 +72,26 @@ def test_sub_steps():
                 break
 
 
+def test_ramp_timers():
+    """Test timers/ramping over the full ramp schedule of the env."""
+    env_gym = Environment(env_name_gym, sticky_action_prob=0.0)
+    env_jax, env_params = gymnax.make(env_name_jax)
+    step_timers_jit = jax.jit(step_timers)
+    env_gym.reset()
+    state = np_state_to_jax(env_gym, env_name_jax, get_jax=True)
+    # Ramp until both speeds are 1 and continue for another ramp interval
+    extra_steps = 0
+    for s in range(3000):
+        step_timers_numpy(env_gym)
+        state = step_timers_jit(state, env_params)
+        assert_correct_state(env_gym, env_name_jax, state, tolerance)
+        if state.spawn_speed == 1 and state.move_speed == 1:
+            extra_steps += 1
+            if extra_steps > env_params.ramp_interval + 1:
+                break
+    assert extra_steps > env_params.ramp_interval + 1
+
+
 def test_reset():
     """Test reset obs/state is in space of NumPy version."""
     # env_gym = Environment(env_name_gym, sticky_action_prob=0.0)
@@ -93,3 +130,179 @@ def test_get_obs():
             # Start a new episode if the previous one has terminated
             if done_gym:
                 break
+
+
+def test_spawn_full_slots():
+    """Test that spawning into a fully occupied board changes nothing."""
+    env_jax, env_params = gymnax.make(env_name_jax)
+    _, state = env_jax.reset(jax.random.PRNGKey(0), env_params)
+    entities = jnp.tile(jnp.array([3, 0, 1, 0, 1], dtype=jnp.int8), (8, 1))
+    entities = entities.at[:, 1].set(jnp.arange(1, 9, dtype=jnp.int8))
+    state = state.replace(entities=entities, spawn_timer=0)
+    for s in range(num_steps):
+        key = jax.random.PRNGKey(s)
+        next_state = step_spawn(key, state)
+        assert (next_state.entities == entities).all()
+
+
+def test_sample_slots():
+    """Test that every free slot can be sampled (incl. a single one)."""
+    for free_slots in [[0], [7], [2, 5], list(range(8))]:
+        state_entities = jnp.ones(8, dtype=jnp.int8)
+        state_entities = state_entities.at[jnp.array(free_slots)].set(0)
+        sampled = set()
+        for s in range(100):
+            slot, free = while_sample_slots(
+                jax.random.PRNGKey(s), state_entities
+            )
+            assert free == 1
+            sampled.add(int(slot))
+        assert sampled == set(free_slots)
+
+
+def test_batched_step():
+    """Test that reset/step can be vmapped over a batch of environments."""
+    rng = jax.random.PRNGKey(0)
+    env_jax, env_params = gymnax.make(env_name_jax)
+    batch_reset = jax.vmap(env_jax.reset, in_axes=(0, None))
+    batch_step = jax.vmap(env_jax.step, in_axes=(0, 0, 0, None))
+
+    rng, rng_reset = jax.random.split(rng)
+    obs, state = batch_reset(jax.random.split(rng_reset, 4), env_params)
+    assert obs.shape == (4, 10, 10, 4)
+    for s in range(num_steps):
+        rng, rng_step, rng_action = jax.random.split(rng, 3)
+        action = jax.random.randint(rng_action, (4,), 0, env_jax.num_actions)
+        obs, state, reward, done, _ = batch_step(
+            jax.random.split(rng_step, 4), state, action, env_params
+        )
+        assert obs.shape == (4, 10, 10, 4)
+        assert reward.shape == (4,)
+        assert state.entities.shape == (4, 8, 5)
+
+
+def test_make_backend():
+    """Test that unsupported backends raise an error in `make`."""
+    with pytest.raises(ValueError):
+        gymnax.make(env_name_jax, backend="Numba")
+    with pytest.raises(ValueError):
+        gymnax.make("Breakout-MinAtar", backend="numba")
+
+
+def test_numba_api():
+    """Test numba backend follows the reset/step API of the JAX env."""
+    pytest.importorskip("numba")
+    from gymnax.environments.minatar import asterix_numba as nb
+
+    rng = jax.random.PRNGKey(0)
+    env_nb, env_params = gymnax.make(env_name_jax, backend="numba")
+    rng, key_reset, key_step = jax.random.split(rng, 3)
+    obs, state = env_nb.reset(key_reset, env_params)
+    assert obs.shape == env_nb.observation_space(env_params).shape
+    assert state.shape == env_nb.state_space(env_params).shape
+    # Same positional API as the JAX env - `key` is ignored in `step`
+    obs, state, reward, done, info = env_nb.step(key_step, state, 0, env_params)
+    assert obs.shape == (10, 10, 4) and state.shape == (nb.STATE_SIZE,)
+
+
+def test_numba_backend():
+    """Test numba backend transitions against the NumPy version."""
+    pytest.importorskip("numba")
+    from gymnax.environments.minatar import asterix_numba as nb
+
+    rng = jax.random.PRNGKey(0)
+    env_gym = Environment(env_name_gym, sticky_action_prob=0.0)
+    env_nb, env_params = gymnax.make(env_name_jax, backend="numba")
+    rng_nb = np.random.default_rng(0)
+
+    def gym_to_flat(env):
+        state = np_state_to_jax(env, env_name_jax)
+        flat = np.zeros(nb.STATE_SIZE, dtype=np.int32)
+        for k in numba_state_keys:
+            flat[getattr(nb, k.upper())] = state[k]
+        flat[nb.ENTITIES :] = np.asarray(state["entities"]).reshape(-1)
+        return flat
+
+    for ep in range(num_episodes):
+        env_gym.reset()
+        for s in range(10 * num_steps):
+            rng, key_action = jax.random.split(rng)
+            action = env_nb.action_space(env_params).sample(key_action)
+            action_gym = minatar_action_map(action, env_name_jax)
+            state = gym_to_flat(env_gym)
+            assert (nb.get_obs(state) == env_gym.state()).all()
+            reward_gym, done_gym = env_gym.act(action_gym)
+            next_state, reward = nb.step_state(
+                state,
+                action_gym,
+                env_params.ramping,
+                env_params.ramp_interval,
+                rng_nb,
+            )
+            # Spawned entities depend on the RNG - see `test_numba_spawn`
+            if state[nb.SPAWN_TIMER] != 0:
+                expected = gym_to_flat(env_gym)
+                assert (next_state[: nb.TIME] == expected[: nb.TIME]).all()
+                assert (
+                    next_state[nb.ENTITIES :] == expected[nb.ENTITIES :]
+                ).all()
+                assert reward == reward_gym
+                assert next_state[nb.TERMINAL] == done_gym
+            if done_gym:
+                break
+
+
+def test_numba_spawn():
+    """Test numba entity spawning into a single free and a full board."""
+    pytest.importorskip("numba")
+    from gymnax.environments.minatar import asterix_numba as nb
+
+    rng_nb = np.random.default_rng(0)
+    full = np.tile(np.array([3, 0, 1, 0, 1], dtype=np.int32), (8, 1))
+    full[:, 1] = np.arange(1, 9)
+    for free_slot in range(nb.NUM_SLOTS):
+        others = np.arange(nb.NUM_SLOTS) != free_slot
+        spawned = set()
+        for s in range(num_steps):
+            entities = full.copy()
+            entities[free_slot] = 0
+            nb.spawn_entity(entities, rng_nb)
+            x, y, lr, gold, filled = entities[free_slot]
+            assert x == (0 if lr else 9) and y == free_slot + 1
+            assert lr in [0, 1] and gold in [0, 1] and filled == 1
+            assert (entities[others] == full[others]).all()
+            spawned.add((lr, gold))
+        assert len(spawned) > 1
+
+    # Spawning into a full board does nothing
+    for s in range(num_steps):
+        entities = full.copy()
+        nb.spawn_entity(entities, rng_nb)
+        assert (entities == full).all()
+
+
+def test_numba_ramp():
+    """Test numba ramping over the full ramp schedule of the env."""
+    pytest.importorskip("numba")
+    from gymnax.environments.minatar import asterix_numba as nb
+
+    env_gym = Environment(env_name_gym, sticky_action_prob=0.0)
+    env_nb, env_params = gymnax.make(env_name_jax, backend="numba")
+    rng_nb = np.random.default_rng(0)
+    env_gym.reset()
+    _, state = env_nb.reset(None, env_params)
+    # Ramp state only depends on the speeds, ramp timer and ramp index
+    ramp_keys = ["spawn_speed", "move_speed", "ramp_timer", "ramp_index"]
+    extra_steps = 0
+    for s in range(3000):
+        step_timers_numpy(env_gym)
+        state, _ = nb.step_state(
+            state, 0, env_params.ramping, env_params.ramp_interval, rng_nb
+        )
+        for k in ramp_keys:
+            assert state[getattr(nb, k.upper())] == getattr(env_gym.env, k)
+        if state[nb.SPAWN_SPEED] == 1 and state[nb.MOVE_SPEED] == 1:
+            extra_steps += 1
+            if extra_steps > env_params.ramp_interval + 1:
+                break
+    assert extra_steps > env_params.ramp_interval + 1
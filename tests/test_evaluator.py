@@ -58,3 +58,19 @@ def test_rollout():
         cum_return,
     ) = manager.population_rollout(rng_batch, batch_params)
     assert obs.shape == (5, 10, 200, 3)
+
+
+def test_rollout_num_env_steps():
+    rng = jax.random.PRNGKey(0)
+    # Random policy rollout that is shorter than the max episode length
+    manager = RolloutWrapper(env_name="Asterix-MinAtar", num_env_steps=50)
+    obs, action, reward, next_obs, done, cum_return = manager.single_rollout(
+        rng, None
+    )
+    assert obs.shape == (50, 10, 10, 4)
+
+    rng_batch = jax.random.split(rng, 4)
+    obs, action, reward, next_obs, done, cum_return = manager.batch_rollout(
+        rng_batch, None
+    )
+    assert obs.shape == (4, 50, 10, 10, 4)